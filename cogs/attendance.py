@@ -1,19 +1,23 @@
 # cogs/attendance.py
+import asyncio
+import logging
+import aiomysql
 import discord
 from discord.ext import commands
 from discord import app_commands
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import List
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
 from config.discord import (
     GUILD_ID, 
     ALLOWED_ROLE_IDS, 
     SKILL_GROUPS, 
     ATTENDANCE_CHANNEL_ID, 
-    SKILL_GROUP_CHOICES
+    SKILL_GROUP_CHOICE_OBJS
 )
 from views.attendance import ExcuseView
-from models.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
 
 class ReportGranularity(Enum):
     DAILY = "daily"
@@ -23,13 +27,25 @@ def has_any_required_role():
     """Check if user has any of the required roles."""
     def predicate(interaction: discord.Interaction) -> bool:
         try:
-            user_roles = interaction.user.roles
-            return any(role.id in ALLOWED_ROLE_IDS for role in user_roles)
+            # Members keep their role ids in _roles; fall back to Role objects otherwise
+            role_ids = getattr(interaction.user, '_roles', None)
+            if role_ids is None:
+                role_ids = [role.id for role in interaction.user.roles]
+            return not ALLOWED_ROLE_IDS.isdisjoint(role_ids)
         except Exception as e:
-            print(f"Error checking roles: {e}")
+            logger.error("Error checking roles: %s", e)
             return False
     return app_commands.check(predicate)
 
+class ReportSession(NamedTuple):
+    """A session's absentees, grouped from the report query rows."""
+    session_date: date
+    session_name: str
+    skill_group: str
+    total_absences: int
+    excused_absences: int
+    students: List[Tuple[int, bool]]
+
 class AttendanceReport:
     """Handles attendance report generation and formatting."""
     
@@ -39,148 +55,188 @@ class AttendanceReport:
     MAX_EMBED_DESCRIPTION_LENGTH = 4096
 
     @staticmethod
-    async def get_report_data(connection, season: int, granularity: ReportGranularity, days: int = 7) -> List[dict]:
-        """Fetches attendance data from database."""
-        try:
-            cursor = connection.cursor(dictionary=True)
-            
-            query = """
-            WITH SessionAbsences AS (
-                SELECT 
-                    s.id AS session_id,
-                    s.session_name,
-                    s.skill_group,
-                    DATE(s.created_date) AS session_date,
-                    l.student_id,
-                    l.is_excused
-                FROM session s
-                JOIN ledger l ON s.id = l.session_id
-                WHERE 
-                    s.season = %s
-                    AND s.created_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
-                    AND l.is_present = FALSE
-            )
-            SELECT 
-                session_date,
-                session_name,
-                skill_group,
-                COUNT(DISTINCT student_id) as total_absences,
-                COUNT(DISTINCT CASE WHEN is_excused THEN student_id END) as excused_absences,
-                GROUP_CONCAT(
-                    CONCAT(student_id, ':', is_excused)
-                    ORDER BY student_id
-                    SEPARATOR ','
-                ) as absent_data
-            FROM SessionAbsences
-            GROUP BY 
-                session_date, 
-                session_name, 
-                skill_group
-            ORDER BY 
-                session_date DESC, 
-                session_name
-            """
-            
-            cursor.execute(query, (season, days))
-            results = cursor.fetchall()
-            cursor.close()
-            return results
-            
-        except Exception as e:
-            print(f"Error fetching report data: {e}")
-            return []
+    def build_session(session_key: tuple, students: List[Tuple[int, bool]]) -> ReportSession:
+        """Folds one session's absentee rows into a single report entry."""
+        session_date, session_name, skill_group = session_key
+        return ReportSession(
+            session_date=session_date,
+            session_name=session_name,
+            skill_group=skill_group,
+            total_absences=len({student_id for student_id, _ in students}),
+            excused_absences=len({student_id for student_id, is_excused in students if is_excused}),
+            students=students
+        )
+
+    @staticmethod
+    async def get_report_data(pool: aiomysql.Pool, season: int, granularity: ReportGranularity, days: int = 7) -> AsyncIterator[ReportSession]:
+        """
+        Streams attendance data from the database, one session at a time.
+
+        Errors propagate to the caller. The server-side cursor keeps its pooled
+        connection checked out until the stream is exhausted or closed.
+        """
+        query = """
+        SELECT 
+            s.created_date,
+            s.session_name,
+            s.skill_group,
+            CAST(l.student_id AS UNSIGNED) AS student_id,
+            l.is_excused
+        FROM session s
+        JOIN ledger l ON s.id = l.session_id AND l.is_present = FALSE
+        WHERE 
+            s.season = %s
+            AND s.created_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
+        ORDER BY 
+            DATE(s.created_date) DESC, 
+            s.session_name,
+            s.skill_group,
+            student_id
+        """
+        
+        async with pool.acquire() as connection:
+            async with connection.cursor(aiomysql.SSCursor) as cursor:
+                await cursor.execute(query, (season, days))
+
+                # One row per absentee; emit each session once its rows are complete
+                current_key = None
+                students = []
+                async for created_date, session_name, skill_group, student_id, is_excused in cursor:
+                    session_key = (created_date.date(), session_name, skill_group)
+                    if session_key != current_key:
+                        if students:
+                            yield AttendanceReport.build_session(current_key, students)
+                        current_key, students = session_key, []
+                    students.append((student_id, is_excused))
+
+                if students:
+                    yield AttendanceReport.build_session(current_key, students)
 
     @staticmethod
-    def create_session_field_content(session: dict, guild: discord.Guild) -> tuple[str, str]:
+    def create_session_field_content(session: ReportSession, name_cache: Dict[int, str]) -> tuple[str, str]:
         """Creates the field name and value for a session entry."""
-        session_date = session['session_date'].strftime('%Y-%m-%d')
-        field_name = f"Session: {session['session_name']} on [{session_date}] for {session['skill_group']}"
+        session_date = session.session_date.isoformat()
+        field_name = f"Session: {session.session_name} on [{session_date}] for {session.skill_group}"
         
-        # Process absent students
-        absent_students = []
-        if session['absent_data']:
-            for student_data in session['absent_data'].split(','):
-                student_id, is_excused = student_data.split(':')
-                member = guild.get_member(int(student_id))
-                if member:
-                    name = member.display_name
-                    status = "(Excused)" if int(is_excused) else "(Unexcused)"
-                    absent_students.append(f"{name} {status}")
-
-        # Create field value
-        field_value = "**Absent:**\n"
-        if absent_students:
-            for i, student in enumerate(absent_students, 1):
-                field_value += f"{i}. {student}\n"
-        else:
-            field_value += "Everyone Present! 🎉\n"
+        # Every reported session has at least one absentee, since the query only returns absences
+        lines = ["**Absent:**"]
+        for i, (student_id, is_excused) in enumerate(session.students, 1):
+            name = name_cache.get(student_id, f"<@{student_id}>")
+            status = "(Excused)" if is_excused else "(Unexcused)"
+            lines.append(f"{i}. {name} {status}")
 
         # Add summary line
-        field_value += f"\nTotal Absences: **{session['total_absences']}** (Excused: {session['excused_absences']})"
+        lines.append(f"\nTotal Absences: **{session.total_absences}** (Excused: {session.excused_absences})")
         
-        return field_name, field_value
+        return field_name, "\n".join(lines)
 
     @staticmethod
-    def create_report_embeds(data: List[dict], season: int, granularity: ReportGranularity, guild: discord.Guild) -> List[discord.Embed]:
-        """Creates a list of Discord embeds for the attendance report, handling pagination."""
-        current_time = datetime.now()
-        embeds = []
-        current_embed = discord.Embed(
-            title=f"Attendance Report - Season {season}",
-            description=f"{granularity.value.title()} report generated at {current_time.strftime('%Y-%m-%d %H:%M:%S')}",
+    def create_page_embed(sessions: List[ReportSession], title: str, description: Optional[str], page: int, name_cache: Dict[int, str]) -> discord.Embed:
+        """Builds one report page. Pure formatting work, so it can run off the event loop."""
+        embed = discord.Embed(
+            title=title,
+            description=description,
             color=discord.Color.blue()
         )
-        
-        if not data:
-            current_embed.add_field(
-                name="No Data",
-                value="No attendance records found for the specified period.",
-                inline=False
-            )
-            return [current_embed]
 
-        field_count = 0
-        
-        # Process each session
-        for session in data:
-            field_name, field_value = AttendanceReport.create_session_field_content(session, guild)
-            
-            # Check if we need a new embed
-            if field_count >= AttendanceReport.MAX_FIELDS_PER_EMBED:
-                embeds.append(current_embed)
-                current_embed = discord.Embed(
-                    title=f"Attendance Report - Season {season} (Continued)",
-                    color=discord.Color.blue()
-                )
-                field_count = 0
+        for session in sessions:
+            field_name, field_value = AttendanceReport.create_session_field_content(session, name_cache)
 
             # Handle field value length limit
             if len(field_value) > AttendanceReport.MAX_FIELD_VALUE_LENGTH:
                 field_value = field_value[:AttendanceReport.MAX_FIELD_VALUE_LENGTH - 3] + "..."
 
-            current_embed.add_field(
+            embed.add_field(
                 name=field_name,
                 value=field_value,
                 inline=False
             )
-            field_count += 1
 
-        # Add the last embed if it has fields
-        if field_count > 0:
-            embeds.append(current_embed)
+        embed.set_footer(text=f"Page {page}")
+        return embed
 
-        # Add page numbers
-        total_pages = len(embeds)
-        for i, embed in enumerate(embeds, 1):
-            embed.set_footer(text=f"Page {i}/{total_pages}")
+    @staticmethod
+    async def create_report_embeds(data: AsyncIterator[ReportSession], season: int, granularity: ReportGranularity, guild: discord.Guild) -> AsyncIterator[discord.Embed]:
+        """Yields the Discord embeds for the attendance report as each page fills up."""
+        timestamp_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        title = f"Attendance Report - Season {season}"
+        continued_title = f"{title} (Continued)"
+        description = f"{granularity.value.title()} report generated at {timestamp_str}"
 
-        return embeds
+        # Resolve display names once rather than per absentee; worker threads only read this dict
+        name_cache = {member.id: member.display_name for member in guild.members}
+        page = 1
+        sessions = []
+        
+        # Collect a page of sessions at a time and format it in a worker thread
+        async for session in data:
+            sessions.append(session)
+            if len(sessions) == AttendanceReport.MAX_FIELDS_PER_EMBED:
+                yield await asyncio.to_thread(
+                    AttendanceReport.create_page_embed, sessions, title, description, page, name_cache
+                )
+                page += 1
+                sessions = []
+                title, description = continued_title, None
+
+        if sessions:
+            yield await asyncio.to_thread(
+                AttendanceReport.create_page_embed, sessions, title, description, page, name_cache
+            )
+        elif page == 1:
+            embed = discord.Embed(
+                title=title,
+                description=description,
+                color=discord.Color.blue()
+            )
+            embed.add_field(
+                name="No Data",
+                value="No attendance records found for the specified period.",
+                inline=False
+            )
+            yield embed
 
 class AttendanceCog(commands.Cog):
     """Cog for handling attendance-related commands."""
     
     def __init__(self, bot):
         self.bot = bot
+        self._roles: Dict[int, Dict[str, discord.Role]] = {}
+
+    def cache_guild_roles(self, guild: discord.Guild) -> Dict[str, discord.Role]:
+        """Resolves and caches a guild's skill group roles by name, skipping any it can't find."""
+        roles = {}
+        for name, role_id in SKILL_GROUPS.items():
+            role = guild.get_role(role_id)
+            if role is not None:
+                roles[name] = role
+        self._roles[guild.id] = roles
+        return roles
+
+    def get_skill_role(self, guild: discord.Guild, name: str) -> Optional[discord.Role]:
+        """Returns a cached skill group role, resolving the guild's roles again on a miss."""
+        role = self._roles.get(guild.id, {}).get(name)
+        if role is None:
+            role = self.cache_guild_roles(guild).get(name)
+        return role
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Resolves skill group roles for every guild up front."""
+        for guild in self.bot.guilds:
+            self.cache_guild_roles(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """Refreshes the cached roles when a skill group role changes."""
+        if after.id in SKILL_GROUPS.values():
+            self.cache_guild_roles(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """Refreshes the cached roles when a skill group role is deleted."""
+        if role.id in SKILL_GROUPS.values():
+            self.cache_guild_roles(role.guild)
 
     @app_commands.command(name="take")
     @app_commands.describe(
@@ -188,10 +244,7 @@ class AttendanceCog(commands.Cog):
         skill_group="Select the skill group to track",
         season="Season number (e.g., 1, 2, 3)"
     )
-    @app_commands.choices(skill_group=[
-        app_commands.Choice(name=choice[0], value=choice[1])
-        for choice in SKILL_GROUP_CHOICES
-    ])
+    @app_commands.choices(skill_group=SKILL_GROUP_CHOICE_OBJS)
     @has_any_required_role()
     async def take(
         self,
@@ -212,7 +265,7 @@ class AttendanceCog(commands.Cog):
                 return
 
             voice_channel = member.voice.channel
-            members_in_vc = voice_channel.members
+            vc_ids = {vc_member.id for vc_member in voice_channel.members}
             
             attendance_channel = interaction.guild.get_channel(ATTENDANCE_CHANNEL_ID)
             if not attendance_channel:
@@ -224,37 +277,31 @@ class AttendanceCog(commands.Cog):
 
             # Handle combined or single role attendance
             if skill_group == "Combined":
-                advanced_role = interaction.guild.get_role(SKILL_GROUPS["Advanced"])
-                mechanics_role = interaction.guild.get_role(SKILL_GROUPS["Mechanics"])
+                advanced_role = self.get_skill_role(interaction.guild, "Advanced")
+                mechanics_role = self.get_skill_role(interaction.guild, "Mechanics")
                 if not advanced_role or not mechanics_role:
                     await interaction.response.send_message(
                         "Could not find one or both roles to track attendance for!", 
                         ephemeral=True
                     )
                     return
-                members_with_role = [
-                    member for member in interaction.guild.members 
-                    if advanced_role in member.roles or mechanics_role in member.roles
-                ]
+                # Dedupe members holding both roles while keeping order
+                members_with_role = list(dict.fromkeys([*advanced_role.members, *mechanics_role.members]))
                 role_name = "Advanced/Mechanics Combined"
             else:
-                role_id = SKILL_GROUPS[skill_group]
-                tracked_role = interaction.guild.get_role(role_id)
+                tracked_role = self.get_skill_role(interaction.guild, skill_group)
                 if not tracked_role:
                     await interaction.response.send_message(
                         f"Could not find the role to track attendance for!", 
                         ephemeral=True
                     )
                     return
-                members_with_role = [
-                    member for member in interaction.guild.members 
-                    if tracked_role in member.roles
-                ]
+                members_with_role = tracked_role.members
                 role_name = tracked_role.name
             
             absent_members = [
                 member for member in members_with_role 
-                if member not in members_in_vc
+                if member.id not in vc_ids
             ]
             
             embed = discord.Embed(
@@ -313,7 +360,7 @@ class AttendanceCog(commands.Cog):
             )
 
         except Exception as e:
-            print(f"Error taking attendance: {e}")
+            logger.error("Error taking attendance: %s", e)
             await interaction.response.send_message(
                 "An error occurred while taking attendance. Please try again.",
                 ephemeral=True
@@ -336,48 +383,51 @@ class AttendanceCog(commands.Cog):
         season: int
     ):
         """Generate an attendance report for the specified period."""
+        pending_send = None
         try:
             await interaction.response.defer()
             
             report_type = ReportGranularity(granularity)
             days_back = 1 if report_type == ReportGranularity.DAILY else 7
-            
-            connection = DatabaseManager.create_connection()
-            if not connection:
+
+            if not self.bot.db_pool:
                 await interaction.followup.send(
                     "Failed to connect to the database. Please try again later.",
                     ephemeral=True
                 )
                 return
-                
-            try:
-                report_data = await AttendanceReport.get_report_data(
-                    connection=connection,
-                    season=season,
-                    granularity=report_type,
-                    days=days_back
-                )
-                
-                embeds = AttendanceReport.create_report_embeds(
-                    data=report_data,
-                    season=season,
-                    granularity=report_type,
-                    guild=interaction.guild
-                )
-                
-                # Send first embed with initial response
-                await interaction.followup.send(embed=embeds[0])
-                
-                # Send additional embeds if they exist
-                if len(embeds) > 1:
-                    for embed in embeds[1:]:
-                        await interaction.followup.send(embed=embed)
-                
-            finally:
-                connection.close()
+
+            report_data = AttendanceReport.get_report_data(
+                pool=self.bot.db_pool,
+                season=season,
+                granularity=report_type,
+                days=days_back
+            )
+            
+            embeds = AttendanceReport.create_report_embeds(
+                data=report_data,
+                season=season,
+                granularity=report_type,
+                guild=interaction.guild
+            )
+            
+            # Send pages in order as they are built, letting the next page
+            # build while the previous one is still being sent
+            async for embed in embeds:
+                if pending_send:
+                    await pending_send
+                pending_send = asyncio.create_task(interaction.followup.send(embed=embed))
+            if pending_send:
+                await pending_send
                 
         except Exception as e:
-            print(f"Error generating attendance report: {e}")
+            logger.error("Error generating attendance report: %s", e)
+            # Settle a page still being sent so its own failure is logged too
+            if pending_send:
+                await asyncio.wait([pending_send])
+                send_error = None if pending_send.cancelled() else pending_send.exception()
+                if send_error is not None and send_error is not e:
+                    logger.error("Error sending report page: %s", send_error)
             await interaction.followup.send(
                 "An error occurred while generating the report. Please try again.",
                 ephemeral=True
@@ -396,7 +446,7 @@ class AttendanceCog(commands.Cog):
                 ephemeral=True
             )
         else:
-            print(f"Command error occurred: {error}")
+            logger.error("Command error occurred: %s", error)
             await interaction.response.send_message(
                 "An error occurred while processing the command. Please try again.",
                 ephemeral=True
@@ -1,140 +1,180 @@
 # cogs/reminder.py
+import asyncio
+import logging
+import time
 import discord
 from discord.ext import commands, tasks
-from datetime import datetime, timedelta
 from typing import Dict, Set
 
+logger = logging.getLogger(__name__)
+
 class VoiceReminderCog(commands.Cog):
     """Cog for handling automatic attendance reminders."""
+
+    # Seconds a coach can be in voice before being reminded
+    REMINDER_DELAY_SECONDS = 300
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.coach_voice_states: Dict[int, datetime] = {}
+        self.coach_voice_states: Dict[int, float] = {}
         self.reminded_coaches: Set[int] = set()
-        self.check_voice_duration.start()
+        self.reminder_tasks: Dict[int, asyncio.Task] = {}
         self.reset_daily_reminders.start()
-        print("VoiceReminderCog initialized")
+        logger.debug("VoiceReminderCog initialized")
         
         # Initialize voice states for coaches already in voice channels
         self.bot.loop.create_task(self.initialize_voice_states())
 
+    def _is_coach(self, member: discord.Member) -> bool:
+        """Checks whether a member holds any of the coach roles."""
+        return not self.bot.config.ALLOWED_ROLE_IDS.isdisjoint(role.id for role in member.roles)
+
+    def start_tracking(self, member: discord.Member, join_time: float):
+        """Records when a coach joined voice (a time.monotonic() value) and schedules their reminder."""
+        self.coach_voice_states[member.id] = join_time
+        self.cancel_reminder(member.id)
+        if member.id in self.reminded_coaches:
+            return
+
+        delay = join_time + self.REMINDER_DELAY_SECONDS - time.monotonic()
+        self.reminder_tasks[member.id] = self.bot.loop.create_task(
+            self.send_reminder(member.guild.id, member.id, max(delay, 0))
+        )
+        logger.debug("Started tracking %s", member.display_name)
+
+    def stop_tracking(self, member_id: int):
+        """Forgets a coach's voice state and cancels any pending reminder."""
+        self.coach_voice_states.pop(member_id, None)
+        self.cancel_reminder(member_id)
+
+    def cancel_reminder(self, member_id: int):
+        """Cancels a coach's pending reminder, if any."""
+        task = self.reminder_tasks.pop(member_id, None)
+        if task:
+            task.cancel()
+
     async def initialize_voice_states(self):
         """Initialize voice states for coaches already in voice channels."""
         await self.bot.wait_until_ready()
-        current_time = datetime.now()
+        current_time = time.monotonic()
         
         for guild in self.bot.guilds:
             for voice_channel in guild.voice_channels:
                 for member in voice_channel.members:
-                    if any(role.id in self.bot.config.ALLOWED_ROLE_IDS for role in member.roles):
-                        self.coach_voice_states[member.id] = current_time
-                        print(f"Initialized voice state for {member.display_name}")
+                    if self._is_coach(member):
+                        self.start_tracking(member, current_time)
+                        logger.debug("Initialized voice state for %s", member.display_name)
 
     def cog_unload(self):
         """Cleanup when cog is unloaded."""
-        self.check_voice_duration.cancel()
         self.reset_daily_reminders.cancel()
-        print("VoiceReminderCog unloaded")
+        for member_id in list(self.reminder_tasks):
+            self.cancel_reminder(member_id)
+        logger.debug("VoiceReminderCog unloaded")
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
         """Tracks when coaches join/leave voice channels."""
         try:
             # Check if member has the coach role
-            has_coach_role = any(role.id in self.bot.config.ALLOWED_ROLE_IDS for role in member.roles)
-            print(f"Voice state update for {member.display_name} (Coach role: {has_coach_role})")
+            has_coach_role = self._is_coach(member)
+            logger.debug("Voice state update for %s (Coach role: %s)", member.display_name, has_coach_role)
             
             if not has_coach_role:
                 return
 
-            current_time = datetime.now()
-
             # Coach joined a voice channel from being outside voice
             if before.channel is None and after.channel is not None:
-                print(f"Coach {member.display_name} joined voice channel {after.channel.name}")
-                self.coach_voice_states[member.id] = current_time
-                print(f"Started tracking {member.display_name} at {current_time}")
+                logger.debug("Coach %s joined voice channel %s", member.display_name, after.channel.name)
+                self.start_tracking(member, time.monotonic())
                 
             # Coach left voice entirely
             elif before.channel is not None and after.channel is None:
-                print(f"Coach {member.display_name} left voice channel {before.channel.name}")
-                self.coach_voice_states.pop(member.id, None)
-                print(f"Stopped tracking {member.display_name}")
+                logger.debug("Coach %s left voice channel %s", member.display_name, before.channel.name)
+                self.stop_tracking(member.id)
+                logger.debug("Stopped tracking %s", member.display_name)
                 
-            print(f"Current coach_voice_states: {self.coach_voice_states}")
+            logger.debug("Current coach_voice_states: %r", self.coach_voice_states)
             
         except Exception as e:
-            print(f"Error in voice state update: {e}")
+            logger.error("Error in voice state update: %s", e)
 
-    @tasks.loop(seconds=30)
-    async def check_voice_duration(self):
-        """Checks if coaches have been in VC for 5 minutes without taking attendance."""
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Starts or stops tracking when a member in voice gains or loses a coach role."""
         try:
-            current_time = datetime.now()
-            print(f"\nChecking voice duration at {current_time}")
-            
-            for guild in self.bot.guilds:
-                attendance_channel = guild.get_channel(self.bot.config.ATTENDANCE_CHANNEL_ID)
-                if not attendance_channel:
-                    print(f"Could not find attendance channel in guild {guild.name}")
-                    continue
-
-                for voice_channel in guild.voice_channels:
-                    coaches = [
-                        member for member in voice_channel.members
-                        if any(role.id in self.bot.config.ALLOWED_ROLE_IDS for role in member.roles)
-                        and member.id not in self.reminded_coaches
-                    ]
-
-                    if coaches:
-                        print(f"Found coaches in {voice_channel.name}: {[c.display_name for c in coaches]}")
-
-                    for coach in coaches:
-                        join_time = self.coach_voice_states.get(coach.id)
-                        if not join_time:
-                            # Initialize join time if not set
-                            print(f"Initializing join time for coach {coach.display_name}")
-                            self.coach_voice_states[coach.id] = current_time
-                            continue
-
-                        time_in_channel = current_time - join_time
-                        print(f"Coach {coach.display_name} has been in channel for {time_in_channel.total_seconds()} seconds")
-
-                        if time_in_channel >= timedelta(minutes=5):
-                            print(f"Sending reminder to coach {coach.display_name}")
-                            
-                            embed = discord.Embed(
-                                title="Attendance Reminder",
-                                description=f"You've been in {voice_channel.name} for 5 minutes. Don't forget to take attendance!",
-                                color=discord.Color.yellow(),
-                                timestamp=current_time
-                            )
-                            embed.set_footer(text="Use /attendance take to record attendance")
-
-                            await attendance_channel.send(
-                                content=f"{coach.mention} Reminder to take attendance!",
-                                embed=embed
-                            )
-
-                            self.reminded_coaches.add(coach.id)
-                            print(f"Added {coach.display_name} to reminded_coaches set")
+            was_coach = self._is_coach(before)
+            is_coach = self._is_coach(after)
+            if was_coach == is_coach:
+                return
+
+            if is_coach and after.voice is not None and after.voice.channel is not None:
+                logger.debug("Member %s became a coach while in voice", after.display_name)
+                self.start_tracking(after, time.monotonic())
+            elif not is_coach:
+                self.stop_tracking(after.id)
 
         except Exception as e:
-            print(f"Error in check_voice_duration: {e}")
+            logger.error("Error in member update: %s", e)
 
-    @check_voice_duration.before_loop
-    async def before_check_voice_duration(self):
-        """Wait for the bot to be ready before starting the loop."""
-        await self.bot.wait_until_ready()
-        print("Voice duration check loop is ready")
+    async def send_reminder(self, guild_id: int, member_id: int, delay: float):
+        """Reminds a coach to take attendance once they've been in voice long enough."""
+        await asyncio.sleep(delay)
+        self.reminder_tasks.pop(member_id, None)
+
+        try:
+            guild = self.bot.get_guild(guild_id)
+            coach = guild.get_member(member_id) if guild else None
+
+            # Re-check the coach is still in voice and hasn't been reminded yet
+            if (
+                coach is None
+                or coach.voice is None
+                or coach.voice.channel is None
+                or member_id not in self.coach_voice_states
+                or member_id in self.reminded_coaches
+                or not self._is_coach(coach)
+            ):
+                return
+
+            attendance_channel = guild.get_channel(self.bot.config.ATTENDANCE_CHANNEL_ID)
+            if not attendance_channel:
+                logger.warning("Could not find attendance channel in guild %s", guild.name)
+                return
+
+            voice_channel = coach.voice.channel
+            logger.debug("Sending reminder to coach %s", coach.display_name)
+            
+            embed = discord.Embed(
+                title="Attendance Reminder",
+                description=(
+                    f"You've been in {voice_channel.name} for {self.REMINDER_DELAY_SECONDS // 60} minutes. "
+                    "Don't forget to take attendance!"
+                ),
+                color=discord.Color.yellow(),
+                timestamp=discord.utils.utcnow()
+            )
+            embed.set_footer(text="Use /attendance take to record attendance")
+
+            await attendance_channel.send(
+                content=f"{coach.mention} Reminder to take attendance!",
+                embed=embed
+            )
+
+            self.reminded_coaches.add(coach.id)
+            logger.debug("Added %s to reminded_coaches set", coach.display_name)
+
+        except Exception as e:
+            logger.error("Error sending reminder: %s", e)
 
     @tasks.loop(hours=24)
     async def reset_daily_reminders(self):
         """Resets the reminded_coaches set once per day."""
         old_count = len(self.reminded_coaches)
         self.reminded_coaches.clear()
-        self.coach_voice_states.clear()
-        print(f"Reset daily reminders. Cleared {old_count} reminded coaches.")
+        for member_id in list(self.coach_voice_states):
+            self.stop_tracking(member_id)
+        logger.debug("Reset daily reminders. Cleared %d reminded coaches.", old_count)
         
         # Re-initialize voice states after reset
         await self.initialize_voice_states()
@@ -143,9 +183,9 @@ class VoiceReminderCog(commands.Cog):
     async def before_reset_daily_reminders(self):
         """Wait for the bot to be ready before starting the loop."""
         await self.bot.wait_until_ready()
-        print("Daily reset loop is ready")
+        logger.debug("Daily reset loop is ready")
 
 async def setup(bot: commands.Bot):
     """Sets up the reminder cog."""
     await bot.add_cog(VoiceReminderCog(bot))
-    print("VoiceReminderCog setup complete")
\ No newline at end of file
+    logger.debug("VoiceReminderCog setup complete")
@@ -1,4 +1,5 @@
 import os
+import aiomysql
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,5 +8,12 @@ DB_CONFIG = {
     'host': os.environ.get('DB_HOST', 'localhost'),
     'user': os.environ.get('DB_USER'),
     'password': os.environ.get('DB_PASSWORD'),
-    'database': os.environ.get('DB_NAME')
+    'db': os.environ.get('DB_NAME')
 }
+
+async def init_pool() -> aiomysql.Pool:
+    """Creates the shared async connection pool used by the bot."""
+    # Recycle idle connections before MySQL's wait_timeout silently drops them
+    return await aiomysql.create_pool(
+        minsize=2, maxsize=10, autocommit=True, pool_recycle=3600, **DB_CONFIG
+    )
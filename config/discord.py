@@ -1,5 +1,7 @@
+from discord import app_commands
+
 GUILD_ID = 1329334053580836950
-ALLOWED_ROLE_IDS = [1329341459329191948]
+ALLOWED_ROLE_IDS = frozenset({1329341459329191948})
 
 # Role configurations for different skill groups
 SKILL_GROUPS = {
@@ -16,6 +18,10 @@ SKILL_GROUP_CHOICES = [
     ('Mechanics', 'Mechanics'),
     ('Combined', 'Combined')
 ]
+SKILL_GROUP_CHOICE_OBJS = [
+    app_commands.Choice(name=name, value=value)
+    for name, value in SKILL_GROUP_CHOICES
+]
 
 # Role configurations for user types
 USER_ROLE_TYPES = {
@@ -1,5 +1,8 @@
 # main.py
 import os
+import logging
+import logging.handlers
+import queue
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -10,12 +13,34 @@ from config.discord import (
     SKILL_GROUPS, 
     ATTENDANCE_CHANNEL_ID
 )
+from config.database import init_pool
 
 # Load environment variables
 load_dotenv()
 TOKEN = os.environ.get('DISCORD_TOKEN')
 if not TOKEN:
     raise ValueError("No Discord token found in .env file!")
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+
+logger = logging.getLogger(__name__)
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Routes all log records through a queue so writing them never blocks the event loop."""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    # getLevelName maps a known level name to its number; anything else comes back as a string
+    level = logging.getLevelName(LOG_LEVEL)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level if isinstance(level, int) else logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    if not isinstance(level, int):
+        logger.warning("Unknown LOG_LEVEL %r, falling back to INFO", LOG_LEVEL)
+    return listener
 
 class AttendanceBot(commands.Bot):
     """Main bot class for handling attendance."""
@@ -38,43 +63,62 @@ class AttendanceBot(commands.Bot):
             'ATTENDANCE_CHANNEL_ID': ATTENDANCE_CHANNEL_ID,
             'GUILD_ID': GUILD_ID
         })
+        self.db_pool = None
 
     async def setup_hook(self):
         """Sets up the bot's commands and syncs with Discord."""
+        # Open the shared database pool before any cog needs it. If the database
+        # is unreachable, the cogs still load and only database commands fail.
+        try:
+            self.db_pool = await init_pool()
+            logger.info("Created database pool")
+        except Exception as e:
+            logger.exception("Error creating database pool: %s", e)
+
         try:
             # Load the attendance cog
             await self.load_extension('cogs.attendance')
-            print("Loaded attendance cog")
+            logger.info("Loaded attendance cog")
             
             # Load the reminder cog
             await self.load_extension('cogs.reminder')
-            print("Loaded reminder cog")
+            logger.info("Loaded reminder cog")
             
             # Sync commands with Discord
             guild = discord.Object(id=GUILD_ID)
             self.tree.copy_global_to(guild=guild)
             await self.tree.sync(guild=guild)
-            print("Synced command tree")
+            logger.info("Synced command tree")
             
         except Exception as e:
-            print(f"Error in setup_hook: {e}")
-            print(f"Error details: {str(e)}")
+            logger.exception("Error in setup_hook: %s", e)
+
+    async def close(self):
+        """Closes the database pool along with the Discord connection."""
+        if self.db_pool:
+            self.db_pool.close()
+            await self.db_pool.wait_closed()
+        await super().close()
 
     async def on_ready(self):
         """Called when the bot has successfully connected to Discord."""
-        print(f'Logged in as {self.user}')
-        print(f'Connected to {len(self.guilds)} guilds')
-        print(f'Bot Application ID: {self.application_id}')  # Print the application ID for verification
-        print('Bot is ready!')
+        logger.info('Logged in as %s', self.user)
+        logger.info('Connected to %d guilds', len(self.guilds))
+        logger.info('Bot Application ID: %s', self.application_id)  # Log the application ID for verification
+        logger.info('Bot is ready!')
 
 def main():
     """Main entry point for the bot."""
+    listener = setup_logging()
     try:
         # Create and run the bot
         client = AttendanceBot()
-        client.run(TOKEN)
+        # Logging is already configured, so skip discord.py's default handler
+        client.run(TOKEN, log_handler=None)
     except Exception as e:
-        print(f"Error starting bot: {e}")
+        logger.exception("Error starting bot: %s", e)
+    finally:
+        listener.stop()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,4 @@
+-- Indexes backing the /report query: sessions are filtered by season and
+-- creation date, then joined to their absent ledger rows.
+CREATE INDEX idx_session_season_date ON session (season, created_date);
+CREATE INDEX idx_ledger_session_present ON ledger (session_id, is_present);
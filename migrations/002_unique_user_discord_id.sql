@@ -0,0 +1,3 @@
+-- sync_users upserts with INSERT ... ON DUPLICATE KEY UPDATE, which needs
+-- discord_id to be unique. Remove any duplicate users before applying.
+CREATE UNIQUE INDEX idx_user_discord_id ON user (discord_id);
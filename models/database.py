@@ -1,30 +1,117 @@
 # models/database.py
-from mysql.connector import Error
-import mysql.connector
+import logging
+import aiomysql
+from aiomysql import Error
+from contextlib import asynccontextmanager
 from datetime import datetime
-from config.database import DB_CONFIG
-from config.discord import USER_ROLE_TYPES, ROLE_PRIORITY
+from typing import AsyncIterator, List, NamedTuple, Optional, Tuple
+from config.discord import USER_ROLE_TYPES, ROLE_PRIORITY, SKILL_GROUPS
+
+logger = logging.getLogger(__name__)
+
+# Position of each user type in ROLE_PRIORITY (higher index = higher priority)
+_PRIORITY_IDX = {role_type: i for i, role_type in enumerate(ROLE_PRIORITY)}
+
+# Skill group name for each skill group role id
+_SKILL_ROLES = {role_id: name for name, role_id in SKILL_GROUPS.items()}
+
+# Role ids that make a member eligible for syncing (a skill role alone does not)
+_RELEVANT_ROLE_IDS = frozenset(USER_ROLE_TYPES)
+
+def _resolve(member) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Works out how a member should be stored in the user table.
+
+    Returns:
+        tuple: (user_type, skill_group), or None if the member should not be synced
+    """
+    # Skip users with no relevant roles
+    role_ids = [role.id for role in member.roles]
+    if _RELEVANT_ROLE_IDS.isdisjoint(role_ids):
+        return None
+
+    # Only the roles that map to a user type matter here
+    member_role_types = [USER_ROLE_TYPES[role_id] for role_id in _RELEVANT_ROLE_IDS.intersection(role_ids)]
+
+    # Take the highest priority role type
+    user_type = max(member_role_types, key=lambda x: _PRIORITY_IDX.get(x, -1))
+
+    # Skip if user_type is not 'student' or 'coach' (based on enum constraint)
+    if user_type not in ['student', 'coach']:
+        return None
+
+    # Check for skill group role; the highest matching role wins
+    skill_group = next(
+        (_SKILL_ROLES[role_id] for role_id in reversed(role_ids) if role_id in _SKILL_ROLES),
+        None
+    )
+    return user_type, skill_group
+
+# Write statements, defined once and shared by every call. aiomysql's
+# executemany() folds the INSERTs into a single multi-row statement.
+SESSION_INSERT_QUERY = """
+INSERT INTO session 
+(session_name, user, skill_group, season, created_date, modified_date) 
+VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+LEDGER_INSERT_QUERY = """
+INSERT INTO ledger 
+(session_id, student_id, is_present, is_excused, event_date) 
+VALUES (%s, %s, %s, %s, %s)
+"""
+
+# Inserts new users and refreshes existing ones in place; relies on the
+# unique index on user.discord_id (migrations/002_unique_user_discord_id.sql).
+USER_UPSERT_QUERY = """
+INSERT INTO user (name, user_type, skill_group, is_active, discord_id)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+name = VALUES(name), user_type = VALUES(user_type),
+skill_group = VALUES(skill_group), is_active = VALUES(is_active)
+"""
+
+class SessionSpec(NamedTuple):
+    """A session to record, along with who attended it."""
+    user_id: int
+    session_name: str
+    skill_group: str
+    season: int
+    present_members: list
+    absent_members: list
+    excused_members: list
 
 class DatabaseManager:
     """Handles all database operations for the attendance bot."""
-    
+
     @staticmethod
-    def create_connection():
-        """Creates and returns a database connection."""
-        try:
-            connection = mysql.connector.connect(**DB_CONFIG)
-            return connection
-        except Error as e:
-            print(f"Error connecting to MySQL database: {e}")
-            return None
+    @asynccontextmanager
+    async def transaction(pool: aiomysql.Pool) -> AsyncIterator[aiomysql.Cursor]:
+        """
+        Yields a cursor whose statements run as a single transaction.
+
+        The pool autocommits by default, so writes that must land together go
+        through here: one BEGIN, one COMMIT on success, and a ROLLBACK if
+        anything raises.
+        """
+        async with pool.acquire() as connection:
+            await connection.begin()
+            try:
+                async with connection.cursor() as cursor:
+                    yield cursor
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
 
     @staticmethod
-    async def create_attendance_records(user_id: int, session_name: str, skill_group: str, season: int, 
+    async def create_attendance_records(pool: aiomysql.Pool, user_id: int, session_name: str, skill_group: str, season: int, 
                                      present_members: list, absent_members: list, excused_members: list) -> bool:
         """
         Creates a session record and corresponding attendance records.
         
         Args:
+            pool (aiomysql.Pool): Shared database connection pool
             user_id (int): Discord ID of the coach taking attendance
             session_name (str): Name of the session being conducted
             skill_group (str): The skill group for the session
@@ -33,165 +120,124 @@ class DatabaseManager:
             absent_members (list): List of members absent from the session
             excused_members (list): List of members with excused absences
         """
-        connection = None
-        try:
-            connection = DatabaseManager.create_connection()
-            if not connection:
-                return False
-            
-            cursor = connection.cursor()
-            
-            # Create session record with corrected column list
-            session_query = """
-            INSERT INTO session 
-            (session_name, user, skill_group, season, created_date, modified_date) 
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            current_time = datetime.now()
-            session_values = (
-                session_name,
-                str(user_id),  # Discord ID directly
-                skill_group,
-                season,
-                current_time,
-                current_time
+        return await DatabaseManager.create_attendance_records_bulk(pool, [
+            SessionSpec(
+                user_id=user_id,
+                session_name=session_name,
+                skill_group=skill_group,
+                season=season,
+                present_members=present_members,
+                absent_members=absent_members,
+                excused_members=excused_members
             )
-            
-            cursor.execute(session_query, session_values)
-            session_id = cursor.lastrowid
-
-            # Create ledger entries for attendance records
-            ledger_query = """
-            INSERT INTO ledger 
-            (session_id, student_id, is_present, is_excused, event_date) 
-            VALUES (%s, %s, %s, %s, %s)
-            """
-            
-            # Process present members
-            for member in present_members:
-                values = (session_id, str(member.id), True, False, current_time)
-                cursor.execute(ledger_query, values)
-
-            # Process absent members
-            for member in absent_members:
-                is_excused = member in excused_members
-                values = (session_id, str(member.id), False, is_excused, current_time)
-                cursor.execute(ledger_query, values)
-
-            connection.commit()
+        ])
+
+    @staticmethod
+    async def create_attendance_records_bulk(pool: aiomysql.Pool, sessions: List[SessionSpec]) -> bool:
+        """
+        Creates several session records and their attendance records in one transaction.
+
+        Each session is inserted on its own so its id can be read back from
+        lastrowid; this holds whatever the server's auto-increment settings are.
+        All ledger rows are then written with one multi-row INSERT, and
+        everything commits together.
+        
+        Args:
+            pool (aiomysql.Pool): Shared database connection pool
+            sessions (List[SessionSpec]): Sessions to record, with their attendance
+        """
+        if not pool:
+            return False
+        if not sessions:
+            return True
+
+        try:
+            async with DatabaseManager.transaction(pool) as cursor:
+                # Create the session records, keeping the id each one was given
+                current_time = datetime.now()
+                session_ids = []
+                for session in sessions:
+                    await cursor.execute(SESSION_INSERT_QUERY, (
+                        session.session_name,
+                        str(session.user_id),  # Discord ID directly
+                        session.skill_group,
+                        session.season,
+                        current_time,
+                        current_time
+                    ))
+                    session_ids.append(cursor.lastrowid)
+
+                # Create ledger entries for every present and absent member in one batch
+                ledger_values = []
+                for session_id, session in zip(session_ids, sessions):
+                    excused_ids = {member.id for member in session.excused_members}
+                    ledger_values.extend(
+                        (session_id, str(member.id), True, False, current_time)
+                        for member in session.present_members
+                    )
+                    ledger_values.extend(
+                        (session_id, str(member.id), False, member.id in excused_ids, current_time)
+                        for member in session.absent_members
+                    )
+                await cursor.executemany(LEDGER_INSERT_QUERY, ledger_values)
+
             return True
             
         except Error as e:
-            print(f"Error creating attendance records: {e}")
-            if connection:
-                connection.rollback()
+            logger.error("Error creating attendance records: %s", e)
             return False
-            
-        finally:
-            if connection:
-                cursor.close()
-                connection.close()
 
 
     @staticmethod
-    async def sync_users(members: list) -> tuple[bool, int, int]:
+    async def sync_users(pool: aiomysql.Pool, members: list) -> tuple[bool, int, int]:
         """
         Syncs Discord users to the database.
         
         Args:
+            pool (aiomysql.Pool): Shared database connection pool
             members (list): List of Discord member objects to sync
             
         Returns:
             tuple: (success: bool, users_added: int, users_updated: int)
         """
-        from config.discord import USER_ROLE_TYPES, ROLE_PRIORITY, SKILL_GROUPS
-        
-        connection = None
+        if not pool:
+            return False, 0, 0
+
+        # Resolve eligible members first so only they reach the database
+        users = []
+        for member in members:
+            # Skip bots
+            if member.bot:
+                continue
+
+            resolved = _resolve(member)
+            if resolved is None:
+                continue
+
+            user_type, skill_group = resolved
+            users.append((member.display_name, user_type, skill_group, 1, str(member.id)))
+
+        if not users:
+            return True, 0, 0
+
         try:
-            connection = DatabaseManager.create_connection()
-            if not connection:
-                return False, 0, 0
-            
-            cursor = connection.cursor()
-            users_added = 0
-            users_updated = 0
-            
-            for member in members:
-                # Skip bots
-                if member.bot:
-                    continue
-                    
-                # Determine user type based on roles
-                user_type = None
-                member_role_types = []
-                skill_group = None
-                
-                # Get all valid role types for this member
-                for role in member.roles:
-                    if role.id in USER_ROLE_TYPES:
-                        member_role_types.append(USER_ROLE_TYPES[role.id])
-                    
-                    # Check for skill group role
-                    if role.id == SKILL_GROUPS["Advanced"]:
-                        skill_group = "Advanced"
-                    elif role.id == SKILL_GROUPS["Mechanics"]:
-                        skill_group = "Mechanics"
-                
-                # If user has any valid roles, select the highest priority one
-                if member_role_types:
-                    # Sort role types by priority and take the highest
-                    sorted_roles = sorted(
-                        member_role_types,
-                        key=lambda x: ROLE_PRIORITY.index(x) if x in ROLE_PRIORITY else -1
-                    )
-                    user_type = sorted_roles[-1]
-                    
-                    # Skip if user_type is not 'student' or 'coach' (based on enum constraint)
-                    if user_type not in ['student', 'coach']:
-                        continue
-                else:
-                    # Skip users with no relevant roles
-                    continue
-                
-                # Check if user exists
-                cursor.execute("SELECT id FROM user WHERE discord_id = %s", (str(member.id),))
-                existing_user = cursor.fetchone()
-                
-                if existing_user:
-                    # Update existing user
-                    update_query = """
-                    UPDATE user 
-                    SET name = %s, user_type = %s, skill_group = %s, is_active = %s 
-                    WHERE discord_id = %s
-                    """
-                    update_values = (member.display_name, user_type, skill_group, 1, str(member.id))
-                    cursor.execute(update_query, update_values)
-                    users_updated += 1
-                else:
-                    # Insert new user
-                    insert_query = """
-                    INSERT INTO user (name, discord_id, user_type, skill_group, is_active)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """
-                    insert_values = (
-                        member.display_name,
-                        str(member.id),
-                        user_type,
-                        skill_group,
-                        1
-                    )
-                    cursor.execute(insert_query, insert_values)
-                    users_added += 1
-            
-            connection.commit()
+            async with DatabaseManager.transaction(pool) as cursor:
+                # Look up which eligible users already exist in a single query
+                discord_ids = [user[-1] for user in users]
+                placeholders = ', '.join(['%s'] * len(discord_ids))
+                await cursor.execute(
+                    f"SELECT discord_id FROM user WHERE discord_id IN ({placeholders})",
+                    discord_ids
+                )
+                existing_ids = {row[0] for row in await cursor.fetchall()}
+                users_updated = sum(1 for user in users if user[-1] in existing_ids)
+                users_added = len(users) - users_updated
+
+                # Insert or update every user in a single batch
+                await cursor.executemany(USER_UPSERT_QUERY, users)
+
             return True, users_added, users_updated
             
         except Error as e:
-            print(f"Error syncing users: {e}")
+            logger.error("Error syncing users: %s", e)
             return False, 0, 0
-            
-        finally:
-            if connection:
-                cursor.close()
-                connection.close()
\ No newline at end of file
@@ -1,21 +1,44 @@
 # views/attendance.py
+import logging
 import discord
 from discord.ui import Button, View, Select
 from models.database import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
 class ExcuseView(View):
     """View class for handling attendance UI components."""
+
+    # Discord allows at most 25 options in a select menu
+    MAX_SELECT_OPTIONS = 25
+
     def __init__(self, absent_members: list, original_embed: discord.Embed, 
                  session_name: str, skill_group: str, season: int):
         super().__init__(timeout=300)
         # Store all necessary data as instance variables
         self.absent_members = absent_members
+        self._absent_by_id = {member.id: member for member in absent_members}
         self.original_embed = original_embed
         self.excused_members = set()
         self.session_name = session_name
         self.skill_group = skill_group
         self.season = season
 
+        # Locate the absent list once so excusing a student only touches their line
+        self._absent_field_index = None
+        self._absent_lines = []
+        for index, field in enumerate(original_embed.fields):
+            if field.name.startswith("Absent Students"):
+                self._absent_field_index = index
+                self._absent_lines = field.value.split('\n')
+                break
+
+        # Line i of the list belongs to absent_members[i]; a truncated list has fewer lines
+        self._line_index_by_id = {
+            member.id: index
+            for index, member in enumerate(absent_members[:len(self._absent_lines)])
+        }
+
         # Create buttons and menus only if there are absent members
         if absent_members:
             excuse_button = Button(
@@ -26,18 +49,8 @@ class ExcuseView(View):
             excuse_button.callback = self.show_select_menu
             self.add_item(excuse_button)
 
-            self.select_student = Select(
-                placeholder="Select student to excuse...",
-                options=[
-                    discord.SelectOption(
-                        label=member.display_name,
-                        value=str(member.id)
-                    ) for member in absent_members
-                ],
-                min_values=1,
-                max_values=1
-            )
-            self.select_student.callback = self.student_selected
+        # The student menu is only built if someone actually clicks the excuse button
+        self.select_student = None
         
         # Always add log attendance button
         log_button = Button(
@@ -50,10 +63,24 @@ class ExcuseView(View):
 
     async def show_select_menu(self, interaction: discord.Interaction):
         try:
+            if self.select_student is None:
+                self.select_student = Select(
+                    placeholder="Select student to excuse...",
+                    options=[
+                        discord.SelectOption(
+                            label=member.display_name,
+                            value=str(member.id)
+                        ) for member in self.absent_members[:self.MAX_SELECT_OPTIONS]
+                    ],
+                    min_values=1,
+                    max_values=1
+                )
+                self.select_student.callback = self.student_selected
+
             self.add_item(self.select_student)
             await interaction.response.edit_message(view=self)
         except Exception as e:
-            print(f"Error showing select menu: {e}")
+            logger.error("Error showing select menu: %s", e)
             await interaction.response.send_message(
                 "An error occurred while showing the menu. Please try again.",
                 ephemeral=True
@@ -62,29 +89,27 @@ class ExcuseView(View):
     async def student_selected(self, interaction: discord.Interaction):
         try:
             selected_id = int(self.select_student.values[0])
-            selected_member = next(m for m in self.absent_members if m.id == selected_id)
+            selected_member = self._absent_by_id[selected_id]
             
+            # Mark their line the first time they are excused
+            line_index = self._line_index_by_id.get(selected_id)
+            if selected_member not in self.excused_members and line_index is not None:
+                self._absent_lines[line_index] += " (Excused ✓)"
+
             # Add to excused set
             self.excused_members.add(selected_member)
             
             new_embed = self.original_embed.copy()
             
-            for field in new_embed.fields:
-                if field.name.startswith("Absent Students"):
-                    lines = field.value.split('\n')
-                    updated_lines = []
-                    for line in lines:
-                        if selected_member.display_name in line:
-                            updated_lines.append(f"{line} (Excused ✓)")
-                        else:
-                            updated_lines.append(line)
-                    new_value = '\n'.join(updated_lines)
-                    new_embed.set_field_at(
-                        index=new_embed.fields.index(field),
-                        name=field.name,
-                        value=new_value,
-                        inline=field.inline
-                    )
+            if self._absent_field_index is not None:
+                field = new_embed.fields[self._absent_field_index]
+                absent_list = '\n'.join(self._absent_lines)
+                new_embed.set_field_at(
+                    index=self._absent_field_index,
+                    name=field.name,
+                    value=absent_list if len(absent_list) <= 1024 else f"{absent_list[:1021]}...",
+                    inline=field.inline
+                )
             
             self.remove_item(self.select_student)
             await interaction.message.edit(embed=new_embed, view=self)
@@ -93,7 +118,7 @@ class ExcuseView(View):
                 ephemeral=True
             )
         except Exception as e:
-            print(f"Error marking student as excused: {e}")
+            logger.error("Error marking student as excused: %s", e)
             await interaction.response.send_message(
                 "An error occurred while marking the absence as excused. Please try again.",
                 ephemeral=True
@@ -109,18 +134,20 @@ class ExcuseView(View):
                 )
                 return
 
-            # Get present members from voice channel
-            voice_channel = interaction.guild.get_channel(interaction.user.voice.channel.id)
-            present_members = voice_channel.members
+            # Snapshot present members from the coach's voice channel
+            voice_channel = interaction.user.voice.channel
+            present_members = tuple(voice_channel.members)
 
-            # Debug print
-            print(f"Logging attendance for session '{self.session_name}' in group '{self.skill_group}' for season {self.season}")
-            print(f"Present members: {len(present_members)}")
-            print(f"Absent members: {len(self.absent_members)}")
-            print(f"Excused members: {len(self.excused_members)}")
+            logger.debug(
+                "Logging attendance for session '%s' in group '%s' for season %s "
+                "(present: %d, absent: %d, excused: %d)",
+                self.session_name, self.skill_group, self.season,
+                len(present_members), len(self.absent_members), len(self.excused_members)
+            )
 
             # Create attendance records
             db_success = await DatabaseManager.create_attendance_records(
+                pool=interaction.client.db_pool,
                 user_id=interaction.user.id,
                 session_name=self.session_name,
                 skill_group=self.skill_group,
@@ -149,12 +176,10 @@ class ExcuseView(View):
                 )
 
         except Exception as e:
-            print(f"Error logging attendance: {e}")
-            # Print more debug info
-            print(f"Current values:")
-            print(f"- session_name: {self.session_name}")
-            print(f"- skill_group: {self.skill_group}")
-            print(f"- season: {self.season}")
+            logger.error(
+                "Error logging attendance for session '%s' in group '%s' for season %s: %s",
+                self.session_name, self.skill_group, self.season, e
+            )
             await interaction.response.send_message(
                 "An error occurred while logging attendance. Please try again.",
                 ephemeral=True